@@ -1,14 +1,44 @@
+from importlib import import_module as _import_module
+
 # Basics must be loaded first
 from .tex_base import *
 from .tex_environment import *
 
 # Other features
 from .document import Document, Section, Subsection
-from .color import *
-from .colormap import *
+from . import color as _color
+from .color import DefineColor, Color, PreambleColor, textcolor, colorbox, PREDEFINED_COLORS, textcolor_callable, colorbox_callable
 from .floating_environment import FloatingFigure, FloatingTable, FloatingEnvironmentMixin
-from .plot import Plot, LinePlot, MatrixPlot
 from .template import Template
-from .table import Table, Tabular
+from .utils import JCh2rgb
 
 from version import __version__
+
+# Features relying on numpy and matplotlib are only imported when first accessed
+_LAZY_FEATURES = {
+    **dict.fromkeys(['LinearColorMap', 'Palette', 'aube_cmap', 'aurore_cmap', 'holi_cmap', 'aube', 'aurore', 'holi',
+                     'PREDEFINED_CMAPS', 'PREDEFINED_PALETTES', 'default_palette'], 'colormap'),
+    **dict.fromkeys(['Plot', 'LinePlot', 'MatrixPlot'], 'plot'),
+    **dict.fromkeys(['Table', 'Tabular'], 'table'),
+    **{module: module for module in ['colormap', 'plot', 'table']}, # Submodules map to themselves
+}
+
+_LAZY_COLOR_CALLABLES = [name for name in _color.__all__ if name not in globals()]
+
+__all__ = [name for name in globals() if not name.startswith('_')] + list(_LAZY_FEATURES) + _LAZY_COLOR_CALLABLES
+
+
+def __getattr__(name):
+    if name in _LAZY_FEATURES:
+        module = _import_module('.' + _LAZY_FEATURES[name], __name__)
+        value = module if name == _LAZY_FEATURES[name] else getattr(module, name)
+    elif name in _LAZY_COLOR_CALLABLES:
+        value = getattr(_color, name)
+    else:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_FEATURES) | set(_LAZY_COLOR_CALLABLES))
@@ -1,13 +1,18 @@
-import sys
+from functools import partial
+
 from python2latex import TexObject, TexCommand
 
 
+def _format_color_spec(color_spec):
+    return ','.join(c if isinstance(c, str) else f'{c:.3f}'.rstrip('0').rstrip('.') for c in color_spec)
+
+
 class DefineColor(TexCommand):
     def __init__(self, color_name, color_model, *color_spec):
         super().__init__('definecolor',
                          color_name,
                          color_model,
-                         ','.join(c if isinstance(c, str) else f'{c:.3f}'.rstrip('0').rstrip('.') for c in color_spec))
+                         _format_color_spec(color_spec))
 
 
 class Color(TexObject):
@@ -53,9 +58,17 @@ class PreambleColor(TexObject):
     def __init__(self, color) -> None:
         super().__init__('preamble_color')
         self.color = color
+        self._built_state = None
+        self._built_tex = ''
 
     def build(self):
-        return DefineColor(self.color.color_name, self.color.color_model, *self.color.color_spec).build()
+        # The color definition is only formatted again if the color changed since the last build (e.g. in dynamic palettes)
+        state = (self.color.color_name, self.color.color_model, tuple(self.color.color_spec))
+        if state != self._built_state:
+            self._built_state = state
+            # Same output as DefineColor, formatted directly since the name and the model are always plain strings
+            self._built_tex = f'\\definecolor{{{state[0]}}}{{{state[1]}}}{{{_format_color_spec(state[2])}}}'
+        return self._built_tex
 
 
 class textcolor(TexCommand):
@@ -108,9 +121,7 @@ def textcolor_callable(color):
             colored_text = textred('hello')
 
     """
-    def color_func(text):
-        return textcolor(color, text)
-    return color_func
+    return partial(textcolor, color)
 
 
 def colorbox_callable(color):
@@ -132,11 +143,25 @@ def colorbox_callable(color):
             highlighted_text = colorboxred('hello')
 
     """
-    def color_func(text):
-        return colorbox(color, text)
-    return color_func
+    return partial(colorbox, color)
+
+
+# The "textNAMEOFTHECOLOR" and "colorboxNAMEOFTHECOLOR" functions of predefined colors are created on first access
+_PREDEFINED_COLORS_SET = frozenset(PREDEFINED_COLORS)
+_PREDEFINED_COLOR_CALLABLES = (('text', textcolor_callable), ('colorbox', colorbox_callable))
+
+__all__ = ['DefineColor', 'Color', 'PreambleColor', 'textcolor', 'colorbox', 'PREDEFINED_COLORS', 'textcolor_callable', 'colorbox_callable'] \
+          + [prefix + color for prefix, _ in _PREDEFINED_COLOR_CALLABLES for color in PREDEFINED_COLORS]
+
+
+def __getattr__(name):
+    for prefix, color_callable in _PREDEFINED_COLOR_CALLABLES:
+        if name.startswith(prefix) and name[len(prefix):] in _PREDEFINED_COLORS_SET:
+            color_func = color_callable(name[len(prefix):])
+            globals()[name] = color_func
+            return color_func
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 
-for color in PREDEFINED_COLORS:
-    setattr(sys.modules[__name__], 'text' + color, textcolor_callable(color))
-    setattr(sys.modules[__name__], 'colorbox' + color, colorbox_callable(color))
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
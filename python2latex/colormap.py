@@ -1,11 +1,22 @@
 import numpy as np
+import re
 import sys
+from bisect import bisect_left
 from copy import deepcopy
+from functools import lru_cache
 
 from python2latex import Color
 from python2latex.utils import JCh2rgb
 
 
+# Index and periodicity of the cyclic channel (i.e. the hue) of the supported color models
+_CYCLIC_CHANNELS = {
+    'hsb': (0, 1),
+    'Hsb': (0, 360),
+    'JCh': (2, 360),
+}
+
+
 class LinearColorMap:
     """
     A colormap is a function which takes as input a float between 0 and 1, and outputs a color.
@@ -25,19 +36,19 @@ class LinearColorMap:
         Creates a linear color map from a sequence of key color anchors.
 
         Args:
-            color_anchors (Sequence[tuple], optional):
+            color_anchors (Union[Sequence[tuple], np.ndarray], optional):
                 Sequence of colors used as key points to interpolate colors in-between. Colors should be a sequence of floats or int representing the colors in the appropriate color model. If using a cyclic variable such as the hue, one can use larger or smaller values than the standard range of accepted values to get different color maps (e.g. in hsb, one can start at blue (h=0.5) and end at orange (h=0.1) without passing by green by adding 1 to the hue of the end color (h=1.1)). Cyclic variable are outputed after the modulo is taken.
             anchor_pos (Sequence[float], optional):
-                Positions of the color anchors relative to one another on the interval [0,1]. By default, colors are evenly spaced on the interval (e.g. if there are 4 color anchors, the positions will be [0, .33, .66, 1]). Should has the same length as 'color_anchors' and must be in increasing order.
+                Positions of the color anchors relative to one another on the interval [0,1]. By default, colors are evenly spaced on the interval (e.g. if there are 4 color anchors, the positions will be [0, .33, .66, 1]). Should has the same length as 'color_anchors' and must be in increasing order. Colors and positions can also be given as NumPy arrays of shape (n_anchors, n_channels) and (n_anchors,), which is the layout used to sample many colors at once.
             color_model (str, optional):
                 Color model (AKA color space) of the colors. Accepted models are 'RGB', 'rgb', 'hsb', 'Hsb' and 'JCh'. Defaults to 'hsb'. The hue being cyclic, the output color is taken modulo the periodicity. Other color model can be used using the 'rgb' model (which is just a basic linear interpolation) and apply further transformation at the end using the 'color_transform' argument.
             color_transform (Callable[[tuple], tuple], optional):
                 Callable that takes an interpolated color as input and outputs a transformed color. Useful for unsupported color models.
         """
         self.color_anchors = color_anchors
-        self.anchor_pos = anchor_pos or np.linspace(0, 1, len(color_anchors))
+        self.anchor_pos = anchor_pos if anchor_pos is not None else np.linspace(0, 1, len(color_anchors))
         self.color_model = color_model
-        self.color_transform = color_transform or (lambda x: x)
+        self.color_transform = color_transform
 
     def interpolate_between_colors(self, frac, color_start, color_end, cyclic=True):
         color = [self._lin_interp(frac, c1, c2) for c1, c2 in zip(color_start, color_end)]
@@ -45,15 +56,9 @@ class LinearColorMap:
         if self.color_model == 'RGB':
             color = [int(c) for c in color]
 
-        if cyclic:
-            if self.color_model == 'hsb':
-                color[0] %= 1
-
-            if self.color_model == 'Hsb':
-                color[0] %= 360
-
-            if self.color_model == 'JCh':
-                color[2] %= 360
+        if cyclic and self.color_model in _CYCLIC_CHANNELS:
+            channel, period = _CYCLIC_CHANNELS[self.color_model]
+            color[channel] %= period
 
         return tuple(color)
 
@@ -61,10 +66,14 @@ class LinearColorMap:
         return scalar_1*(1-frac) + scalar_2*frac
 
     def __call__(self, scalar: float, cyclic: bool = True):
-        idx_color_start, idx_color_end = 0, 1
-        while scalar > self.anchor_pos[idx_color_end]:
-            idx_color_start += 1
-            idx_color_end += 1
+        """
+        Maps a scalar between 0 and 1 to a color. If 'scalar' is a sequence or an array of scalars, the colors are computed at once with 'map_many' and a list of colors is returned.
+        """
+        if np.ndim(scalar) > 0:
+            return self.map_many(scalar, cyclic)
+
+        idx_color_end = min(max(bisect_left(self.anchor_pos, scalar), 1), len(self.anchor_pos) - 1)
+        idx_color_start = idx_color_end - 1
 
         interval_width = self.anchor_pos[idx_color_end] - self.anchor_pos[idx_color_start]
         interp_frac = (scalar - self.anchor_pos[idx_color_start])/interval_width
@@ -80,6 +89,38 @@ class LinearColorMap:
 
         return interp_color
 
+    def map_many(self, scalars, cyclic: bool = True):
+        """
+        Computes the colors of many scalars at once. Equivalent to [cmap(scalar) for scalar in scalars], but the anchors are located and the colors interpolated with vectorized NumPy operations.
+
+        Args:
+            scalars (Iterable[float]): Scalars between 0 and 1 to map to colors.
+            cyclic (bool): Whether cyclic channels (i.e. the hue) are taken modulo their periodicity.
+
+        Returns a list of colors as tuples.
+        """
+        scalars = np.asarray(scalars, dtype=float)
+        anchor_pos = np.asarray(self.anchor_pos, dtype=float)
+        color_anchors = np.asarray(self.color_anchors, dtype=float)
+
+        idx_color_end = np.clip(np.searchsorted(anchor_pos, scalars), 1, len(anchor_pos) - 1)
+        idx_color_start = idx_color_end - 1
+        interval_width = anchor_pos[idx_color_end] - anchor_pos[idx_color_start]
+        interp_frac = ((scalars - anchor_pos[idx_color_start])/interval_width)[:, None]
+
+        colors = self._lin_interp(interp_frac, color_anchors[idx_color_start], color_anchors[idx_color_end])
+
+        if self.color_model == 'RGB':
+            colors = np.trunc(colors).astype(int)
+
+        if cyclic and self.color_model in _CYCLIC_CHANNELS:
+            channel, period = _CYCLIC_CHANNELS[self.color_model]
+            colors[:, channel] %= period
+
+        if self.color_transform is None:
+            return [tuple(color) for color in colors.tolist()]
+        return [self.color_transform(tuple(color)) for color in colors.tolist()]
+
 
 class Palette:
     """
@@ -97,7 +138,8 @@ class Palette:
                  color_names=None,
                  cmap_range=lambda n_colors: (1/(2*n_colors), 1-1/(2*n_colors)),
                  color_transform=None,
-                 max_n_colors=10_000):
+                 max_n_colors=10_000,
+                 batch_transform=False):
         """
         The default behavior of this palette is to create dynamically evenly spaced colors from a color map as needed. One can change this behavior by specifying a fixed number of colors, or by passing an iterable of colors instead of a color map.
 
@@ -116,6 +158,8 @@ class Palette:
                 Transformation to be applied on the color before the Color object is created. For example, can be used to convert JCh colors from a color map to rgb or hsb colors.
             max_n_colors (int):
                 Upper bound on the number of generated colors to avoid infinite iteration when generating dynamically the palette from a color map.
+            batch_transform (bool):
+                Whether 'color_transform' accepts an array of colors of shape (n_colors, n_channels) and returns an array of transformed colors of the same shape, such as JCh2rgb. If True, all colors are transformed in a single call instead of one call per color.
         """
         self.colors = colors
         self.color_model = color_model
@@ -125,8 +169,9 @@ class Palette:
             old_cmap_range = (cmap_range[0], cmap_range[1])
             cmap_range = lambda n_colors: old_cmap_range
         self.cmap_range = cmap_range
-        self.color_transform = color_transform or (lambda x: x)
+        self.color_transform = color_transform
         self.max_n_colors = max_n_colors
+        self.batch_transform = batch_transform
 
         self.tex_colors = []
         if not (callable(self.colors) and self.n_colors is None): # Not a dynamic palette
@@ -134,16 +179,35 @@ class Palette:
 
     def _init_colors(self):
         if callable(self.colors): # Create iterable from color map if needed
-            start, stop = self.cmap_range(self.n_colors)
-            colors = [self.colors(frac) for frac in np.linspace(start, stop, self.n_colors)]
+            colors = self._sample_color_map(self.n_colors)
         else:
-            colors = self.colors
+            colors = list(self.colors) # Iterables such as generators can only be consumed once
 
         color_names = self.color_names or ('' for _ in colors)
-        for color, name in zip(colors, color_names):
-            self.tex_colors.append(Color(*self.color_transform(color),
-                                            color_name=name,
-                                            color_model=self.color_model))
+        color_model = self.color_model
+        self.tex_colors.extend(Color(*color_spec, color_name=name, color_model=color_model)
+                               for color_spec, name in zip(self._transform_colors(colors), color_names))
+
+    def _transform_colors(self, colors):
+        """
+        Applies the color transform to all colors. If 'batch_transform' is True, the transform is called once on the array of all colors.
+        """
+        if self.color_transform is None:
+            return list(colors)
+        colors = list(colors)
+        if self.batch_transform and colors: # An empty list would not have the shape of an array of colors
+            return np.asarray(self.color_transform(np.array(colors))).tolist()
+        return [self.color_transform(color) for color in colors]
+
+    def _sample_color_map(self, n_colors):
+        """
+        Samples n_colors evenly spaced colors in the range of the color map. Linear color maps are sampled all at once.
+        """
+        start, stop = self.cmap_range(n_colors)
+        fracs = np.linspace(start, stop, n_colors)
+        if isinstance(self.colors, LinearColorMap):
+            return self.colors.map_many(fracs)
+        return [self.colors(frac) for frac in fracs]
 
     def __getitem__(self, idx):
         return self.tex_colors[idx]
@@ -170,12 +234,11 @@ class Palette:
 
         while n_colors < self.max_n_colors:
             n_colors += 1
-            start, stop = self.cmap_range(n_colors)
-            color_specs = [self.color_transform(self.colors(frac)) for frac in np.linspace(start, stop, n_colors)]
+            color_specs = self._transform_colors(self._sample_color_map(n_colors))
 
             # Update old colors
             for tex_color, color_spec in zip(self.tex_colors, color_specs):
-                tex_color.color_spec = color_spec
+                tex_color.color_spec = tuple(color_spec) # Same type as the specs of new colors
 
             new_color = Color(*color_specs[-1], color_model=self.color_model)
             self.tex_colors.append(new_color)
@@ -217,13 +280,15 @@ aube = Palette(aube_cmap,
                color_model='rgb',
                n_colors=None,
                cmap_range=lambda n_colors: (0, 1-1/(2*n_colors+2)),
-               color_transform=JCh2rgb)
+               color_transform=JCh2rgb,
+               batch_transform=True)
 
 aurore = Palette(aurore_cmap,
                  color_model='rgb',
                  n_colors=None,
                  cmap_range=lambda n_colors: (1/(3*n_colors), 1-1/(3*n_colors)),
-                 color_transform=JCh2rgb)
+                 color_transform=JCh2rgb,
+                 batch_transform=True)
 
 def _holi_cmap_range(n_colors):
     if n_colors == 2:
@@ -238,7 +303,8 @@ holi = Palette(holi_cmap,
                color_model='rgb',
                n_colors=None,
                cmap_range=_holi_cmap_range,
-               color_transform=JCh2rgb)
+               color_transform=JCh2rgb,
+               batch_transform=True)
 
 
 PREDEFINED_CMAPS = {
@@ -247,15 +313,25 @@ PREDEFINED_CMAPS = {
     'holi': holi_cmap,
 }
 
+@lru_cache(maxsize=None)
+def _predefined_palette_name_pattern(cmap_names):
+    """
+    Returns a regex matching a palette name among 'cmap_names', optionally followed by a number of colors (e.g. 'holi' or 'holi5'). Longer names are tried first so that no name is shadowed by one of its prefixes.
+    """
+    names = sorted(cmap_names, key=len, reverse=True)
+    return re.compile('(' + '|'.join(map(re.escape, names)) + r')(\d*)')
+
 class _PredefinedPalettes:
     def __getitem__(self, palette_name):
-        for cmap_name in PREDEFINED_CMAPS.keys():
-            if palette_name.startswith(cmap_name):
-                remainder = palette_name[len(cmap_name):]
-                palette = getattr(sys.modules[__name__], cmap_name)
-                if remainder != '':
-                    palette = palette(int(remainder))
-                return palette
+        # The pattern is looked up on each access since color maps can be added to PREDEFINED_CMAPS at any time
+        match = _predefined_palette_name_pattern(tuple(PREDEFINED_CMAPS)).fullmatch(palette_name)
+        if match is None:
+            raise KeyError(palette_name)
+        cmap_name, n_colors = match.groups()
+        palette = getattr(sys.modules[__name__], cmap_name)
+        if n_colors != '':
+            palette = palette(int(n_colors))
+        return palette
 
 PREDEFINED_PALETTES = _PredefinedPalettes()
 
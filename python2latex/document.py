@@ -96,7 +96,7 @@ class Document(TexEnvironment):
         """
         tex = super().build()
 
-        tex = build(self.doc_class) + '\n' + self.build_preamble() + '\n' + tex
+        tex = '\n'.join((build(self.doc_class), self.build_preamble(), tex)) # Single join so the body is copied only once
         if save_to_disk:
             self.file.save(tex)
 
@@ -1,6 +1,6 @@
 import warnings
 
-from python2latex import TexEnvironment, TexObject, TexCommand
+from python2latex import TexEnvironment, TexObject, TexCommand, build
 
 
 class Caption(TexCommand):
@@ -19,6 +19,9 @@ class _FloatingEnvironment(TexEnvironment):
     """
     LaTeX floating environment. This should be inherited.
     """
+    _built_caption_state = None
+    _built_caption = ('', '')
+
     def __init__(self,
                  env_name,
                  star_env=False,
@@ -57,8 +60,7 @@ class _FloatingEnvironment(TexEnvironment):
         tex_body = [part for part in self.body]
         
         if self.caption:
-            caption = Caption(self.caption)
-            space = TexCommand('vspace', self.caption_space) if self.caption_space else ''
+            caption, space = self._build_caption()
 
             if self.caption_pos == 'top':
                 tex_body = [caption, self._label, space] + tex_body
@@ -71,6 +73,19 @@ class _FloatingEnvironment(TexEnvironment):
 
         return self._build_list(tex_body)
 
+    def _build_caption(self):
+        """
+        Builds the caption and the space separating it from the content. The result is reused as long as the caption and the caption space are unchanged strings.
+        """
+        state = (self.caption, self.caption_space)
+        if state == self._built_caption_state and all(type(part) is str for part in state):
+            return self._built_caption
+
+        caption = build(Caption(self.caption), self)
+        space = build(TexCommand('vspace', self.caption_space), self) if self.caption_space else ''
+        self._built_caption_state, self._built_caption = state, (caption, space)
+        return self._built_caption
+
 
 class FloatingFigure(_FloatingEnvironment):
     """
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from numbers import Real, Integral
 import numpy as np
 
@@ -9,6 +10,16 @@ TODO:
 - Add col_space params
 """
 
+_SEP = ' & '
+_EOL = r'\\'
+
+_IDX_TO_SLICE = {
+    (int, int): lambda i, j: (slice(i, i + 1), slice(j, j + 1)),
+    (int, slice): lambda i, j: (slice(i, i + 1), j),
+    (slice, int): lambda i, j: (i, slice(j, j + 1)),
+    (slice, slice): lambda i, j: (i, j),
+}
+
 
 class Table(FloatingEnvironmentMixin, super_class=FloatingTable):
     """
@@ -133,7 +144,12 @@ class Tabular(TexEnvironment):
         self.bottom_rule = bottom_rule
 
         self.shape = shape
-        self.alignment = [alignment] * shape[1] if isinstance(alignment, str) else alignment
+        if isinstance(alignment, str):
+            self.alignment = [alignment] * shape[1]
+        elif len(alignment) == shape[1]:
+            self.alignment = list(alignment)
+        else:
+            raise ValueError(f'Invalid alignment {alignment}. It should be a string or a sequence of {shape[1]} strings (one for each column).')
         self.float_format = float_format
         self.decimal_separator = decimal_separator
         self.int_format = int_format
@@ -152,6 +168,10 @@ class Tabular(TexEnvironment):
         return SelectedArea(self, idx)
 
     def __setitem__(self, idx, value):
+        if isinstance(idx, tuple) and len(idx) == 2 and type(idx[0]) is int and type(idx[1]) is int:
+            # A single cell cannot be merged, so no area needs to be selected
+            self.data[idx] = value
+            return
         selected_area = self[idx]
         if isinstance(value, (str, Real, Integral)) and selected_area.size > 1:
             # There are multirows or multicolumns to treat
@@ -162,39 +182,78 @@ class Tabular(TexEnvironment):
     def __repr__(self):
         return repr(self.data)
 
-    def _apply_commands(self, i, j, content):
-        command_list = self.commands[i, j]
+    def _apply_command_list(self, command_list, content):
         for command in command_list:
-            content = build(command(content), self)
+            # Highlights are wrapped directly since they do not need packages, which avoids instantiating a command per cell
+            if command is bold:
+                content = f'\\textbf{{{content}}}'
+            elif command is italic:
+                content = f'\\textit{{{content}}}'
+            else:
+                content = build(command(content), self)
         return content
 
-    def _format_number(self, i, j, content):
-        format_spec = self.formats_spec[i, j]
+    def _number_formatter(self):
+        """
+        Returns a function converting the content of a cell to TeX: numbers are formatted given their format specification and other contents are built. The default formats and the decimal separator are bound once so they are not looked up again for every cell.
+        """
+        int_format, float_format, decimal_separator = self.int_format, self.float_format, self.decimal_separator
+
+        def format_number(content, format_spec):
+            if type(content) is float: # Fast path for the most common case; numpy scalars and other numbers go through isinstance
+                if format_spec is None:
+                    format_spec = float_format
+            elif not isinstance(content, (Real, Integral)):
+                return build(content)
+            elif format_spec is None: # Fallback to default
+                format_spec = int_format if isinstance(content, Integral) else float_format
+            content = format(content, format_spec)
+
+            if decimal_separator != '.':
+                content = content.replace('.', decimal_separator)
 
-        if not isinstance(content, (Real, Integral)):
             return content
 
-        if format_spec is not None:
-            content = format(content, format_spec)
-        elif format_spec is None and isinstance(content, Integral):
-            content = format(content, self.int_format)
-        elif format_spec is None and isinstance(content, Real): # Fallback to default
-            content = format(content, self.float_format)
+        return format_number
 
-        if self.decimal_separator != '.':
-            content = content.replace('.', self.decimal_separator)
+    def _build_cells(self):
+        """
+        Formats the numbers, builds the content and applies the commands of every cell of the table.
+        Returns a list of rows, each being a list of the TeX strings of the cells. Plain lists are used instead of an object array since they are faster to index and assign cell by cell.
+        """
+        n_rows, n_cols = self.shape
+        if not (self.data != '').any() and not self.commands.astype(bool).any(): # Empty table, nothing to format
+            return [[''] * n_cols for _ in range(n_rows)]
 
-        return content
+        contents = self.data.ravel().tolist()
+        formats_spec = self.formats_spec.ravel().tolist()
+        commands = self.commands.ravel().tolist()
+
+        format_number = self._number_formatter()
+        tex_cells = [format_number(content, format_spec) for content, format_spec in zip(contents, formats_spec)]
+
+        for k, command_list in enumerate(commands):
+            if command_list:
+                tex_cells[k] = self._apply_command_list(command_list, tex_cells[k])
+        return [tex_cells[i*n_cols:(i+1)*n_cols] for i in range(n_rows)]
+
+    def _apply_multicells(self, tex_array):
+        """
+        Wraps the content of merged cells with 'multicolumn' and 'multirow' commands and builds them, so that every cell of tex_array remains a TeX string.
+        Returns the set of (i, j) positions of the column separators blanked by the merged cells, where (i, j) is the separator following the cell (i, j).
+        """
+        blanked_separators = set()
+        if not self.multicells:
+            return blanked_separators
 
-    def _apply_multicells(self, tex_array, tex_array_format):
         for idx, v_align, h_align, v_shift in self.multicells:
 
-            start_i, stop_i, _ = idx[0].indices(self.shape[0])
-            start_j, stop_j, _ = idx[1].indices(self.shape[1])
+            start_i, stop_i, step_i = idx[0].indices(self.shape[0])
+            start_j, stop_j, step_j = idx[1].indices(self.shape[1])
 
-            tex_array_format[start_i, slice(start_j, stop_j - 1)] = ''
-            cell_shape = tex_array[idx].shape
-            content = tex_array[start_i, start_j]
+            blanked_separators.update((start_i, j) for j in range(start_j, stop_j - 1))
+            cell_shape = len(range(start_i, stop_i, step_i)), len(range(start_j, stop_j, step_j))
+            content = tex_array[start_i][start_j]
 
             if start_i == stop_i - 1: # Multicolumn only
                 content = multicolumn(cell_shape[1], h_align, content)
@@ -204,7 +263,9 @@ class Tabular(TexEnvironment):
             if start_j < stop_j - 1 and start_i < stop_i - 1: # Multirow and multicolumn needed
                 content = multicolumn(cell_shape[1], h_align, content)
 
-            tex_array[start_i, start_j] = content
+            tex_array[start_i][start_j] = build(content, self)
+
+        return blanked_separators
 
     def build(self):
         tex = [build(self.head) + '{' + ''.join(self.alignment) + '}']
@@ -212,29 +273,32 @@ class Tabular(TexEnvironment):
         if self.top_rule:
             tex.append(r'\toprule')
 
-        tex_array = np.full_like(self.data, '', dtype=object)
-
-        for i, row in enumerate(self.data):
-            for j, content in enumerate(row):
-                content = self._format_number(i, j, content)
-                content = build(content)
-                content = self._apply_commands(i, j, content)
-                tex_array[i, j] = content
-
-        tex_array_format = np.array([[' & ']*(self.shape[1] - 1) + [r'\\']]*self.shape[0])
-
-        self._apply_multicells(tex_array, tex_array_format)
-
-        for i, (row, row_format) in enumerate(zip(tex_array, tex_array_format)):
-            tex.append(''.join(build(item, self) for pair in zip(row, row_format) for item in pair))
+        tex_array = self._build_cells()
+        blanked_separators = self._apply_multicells(tex_array)
+        blanked_separators_by_row = {}
+        for i, j in blanked_separators:
+            blanked_separators_by_row.setdefault(i, []).append(j)
+        row_format = (_SEP,) * (self.shape[1] - 1) + (_EOL,) # Identical for every row, except for the blanked separators
+
+        tex_body = []
+        interleaved_row = [''] * (2*self.shape[1]) # Preallocated buffer alternating cells and separators
+        for i, row in enumerate(tex_array):
+            if i in blanked_separators_by_row: # Separators blanked by a multicolumn
+                interleaved_row[0::2] = row
+                interleaved_row[1::2] = row_format
+                for j in blanked_separators_by_row[i]:
+                    interleaved_row[2*j + 1] = ''
+                tex_body.append(''.join(interleaved_row))
+            else:
+                tex_body.append(_SEP.join(row) + _EOL)
             if i in self.rules:
-                for rule in self.rules[i]:
-                    tex.append(build(rule))
+                tex_body.extend(build(rule) for rule in self.rules[i])
+        tex.append('\n'.join(tex_body)) # Rows are joined here so _build_list handles a single string
 
         if self.bottom_rule:
             tex.append(r'\bottomrule')
 
-        tex += [self.tail]
+        tex.append(self.tail)
         return self._build_list(tex)
 
 
@@ -249,17 +313,23 @@ class SelectedArea:
     def __init__(self, tabular, idx):
         self.tabular = tabular
         self.slices = self._convert_idx_to_slice(idx)
+        self._indices = tuple(s.indices(n) for s, n in zip(self.slices, tabular.shape))
 
     def _convert_idx_to_slice(self, idx):
         if isinstance(idx, tuple):
             i, j = idx
         else:
             i, j = idx, slice(None)
+
+        convert = _IDX_TO_SLICE.get((type(i), type(j)))
+        if convert is not None: # Common index types are dispatched directly
+            return convert(i, j)
+
         if isinstance(i, Integral):
             i = slice(i, i + 1)
         if isinstance(j, Integral):
             j = slice(j, j + 1)
-        if not isinstance(i, slice) or not isinstance(i, slice):
+        if not isinstance(i, slice) or not isinstance(j, slice):
             raise ValueError(f'Invalid index {idx}. It should be an integral, a slice or a tuple of intregrals or slices.')
         return i, j
 
@@ -273,12 +343,12 @@ class SelectedArea:
 
     @property
     def size(self):
-        return self.tabular.data[self.slices].size
+        n_rows, n_cols = (len(range(*indices)) for indices in self._indices)
+        return n_rows * n_cols
 
     @property
     def idx(self):
-        start_i, stop_i, _ = self.slices[0].indices(self.tabular.shape[0])
-        start_j, stop_j, _ = self.slices[1].indices(self.tabular.shape[1])
+        (start_i, stop_i, _), (start_j, stop_j, _) = self._indices
         return (start_i, start_j), (stop_i, stop_j)
 
     def __repr__(self):
@@ -347,8 +417,9 @@ class SelectedArea:
 
         Returns self.
         """
-        self.tabular.add_package('multicol')
-        self.tabular.add_package('multirow')
+        for package in ('multicol', 'multirow'):
+            if package not in self.tabular.packages: # Skips merging empty options if already added
+                self.tabular.add_package(package)
 
         self.data = ''  # Erase old value
         multicell_params = (self.slices, v_align, h_align, v_shift)
@@ -371,6 +442,14 @@ class SelectedArea:
             for command_list in row:
                 command_list.append(command)
 
+    def _numeric_view(self):
+        """
+        Returns the values of the selected area as a float array, where cells which are not numbers (e.g. text) are NaN.
+        """
+        data = self.data
+        values = (value if isinstance(value, (Real, Integral)) else np.nan for value in data.ravel().tolist())
+        return np.fromiter(values, dtype=float, count=data.size).reshape(data.shape)
+
     def highlight_best(self, mode='high', best='bold', not_best=None, atol=5e-3, rtol=0):
         """
         Highlights the best value(s) inside the selected area of the tabular. Ignores text. If multiple values are equal to an absolute tolerance of atol and relative tolerance of rtol, both are highlighted.
@@ -385,11 +464,9 @@ class SelectedArea:
         Returns self.
         """
         if mode == 'high' or mode == 'max':
-            best_value = -np.inf
-            value_is_better_than_best = lambda value, current_best: value > current_best
+            argbest, nanargbest = np.argmax, np.nanargmax
         elif mode == 'low' or mode == 'min':
-            best_value = np.inf
-            value_is_better_than_best = lambda value, current_best: value < current_best
+            argbest, nanargbest = np.argmin, np.nanargmin
         else:
             raise ValueError(f'Invalid value {mode} for mode argument.')
 
@@ -403,31 +480,22 @@ class SelectedArea:
         elif not_best == 'italic':
             not_best = italic
 
-        # Find best value
-        best_idx = [(None, None)]
-        for i, row in enumerate(self.data):
-            for j, value in enumerate(row):
-                if isinstance(value, (Real, Integral)) and value_is_better_than_best(value, best_value):
-                    best_idx = [(i, j)]
-                    best_value = value
-
-        # Find values close to best
-        for i, row in enumerate(self.data):
-            for j, value in enumerate(row):
-                if isinstance(value, (Real, Integral)) and np.isclose(value, best_value, rtol, atol) \
-                    and (i, j) not in best_idx:
-                    best_idx.append((i, j))
-
-        if best_idx[0][0] is not None: # Best have been found (i.e. there are floats or ints in selected area)
-            start_i, start_j = self.idx[0]
-            stop_i, stop_j = self.idx[1]
-
-            for i in range(stop_i-start_i):
-                for j in range(stop_j-start_j):
-                    if (i, j) in best_idx:
-                        self.tabular.commands[i+start_i, j+start_j].append(best)
-                    elif not_best is not None:
-                        self.tabular.commands[i+start_i, j+start_j].append(not_best)
+        values = self._numeric_view()
+        is_nan = np.isnan(values)
+        if is_nan.all(): # No floats or ints in selected area
+            return self
+
+        # Find best value and values close to best. Dense numeric areas skip the NaN-aware reduction, which copies the values.
+        best_idx = nanargbest(values) if is_nan.any() else argbest(values)
+        best_value = values.flat[best_idx]
+        is_best = np.isclose(values, best_value, rtol, atol)
+
+        for command_list, cell_is_best in zip(self.tabular.commands[self.slices].ravel().tolist(),
+                                              is_best.ravel().tolist()):
+            if cell_is_best:
+                command_list.append(best)
+            elif not_best is not None:
+                command_list.append(not_best)
 
         return self
 
@@ -488,13 +556,21 @@ class cmidrule(TexCommand):
     def __eq__(self, other):
         return self.start == other.start and self.end == other.end and self.trim == other.trim
 
-    def build(self):
-        rule = super().build()
-        if self.trim:
-            rule += f"({self.trim})"
-        rule += f"{{{self.start + 1}-{self.end}}}"
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _build_rule(start, end, trim):
+        """
+        Tables often repeat the same rules, hence the built strings are memoized.
+        """
+        rule = r'\cmidrule'
+        if trim:
+            rule += f"({trim})"
+        rule += f"{{{start + 1}-{end}}}"
         return rule
 
+    def build(self):
+        return self._build_rule(self.start, self.end, self.trim)
+
 
 class midrule(TexCommand):
     def __init__(self):
@@ -1,5 +1,12 @@
+import itertools
 import os
-from subprocess import DEVNULL, STDOUT, check_call
+import subprocess
+import tempfile
+
+
+# The umask can only be read by setting it, which is done once at import time
+_UMASK = os.umask(0)
+os.umask(_UMASK)
 
 
 def build(obj, parent=None):
@@ -8,14 +15,19 @@ def build(obj, parent=None):
     """
     if isinstance(obj, TexObject):
         built_obj = obj.build()
-        if parent is not None:
+        if parent is not None and (obj.packages or obj.preamble):
             for package_name, package in obj.packages.items():
+                parent_package = parent.packages.get(package_name)
+                if (parent_package is not None
+                    and set(package.options) <= set(parent_package.options)
+                    and package.kwoptions.items() <= parent_package.kwoptions.items()):
+                    continue # Already merged at a previous build or from another child
                 parent.add_package(package_name, *package.options, **package.kwoptions)
             for line in obj.preamble:
                 parent.add_to_preamble(line)
         return built_obj
     elif hasattr(obj, 'build'):
-        built_obj = obj.build()
+        return obj.build()
     else:
         return str(obj)
 
@@ -34,8 +46,16 @@ class TexFile:
 
     def save(self, tex):
         os.makedirs(self.filepath, exist_ok=True)
-        with open(self.path, 'w', encoding='utf8') as file:
-            file.write(tex)
+        # The file is written aside then moved in place so that readers never see a partially written file
+        fd, tmp_path = tempfile.mkstemp(dir=self.filepath, suffix='.tmp')
+        try:
+            with open(fd, 'w', encoding='utf8') as file:
+                file.write(tex)
+            os.chmod(tmp_path, 0o666 & ~_UMASK) # mkstemp creates private files, but the TeX file should get the usual permissions
+            os.replace(tmp_path, self.path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
 
     def compile_to_pdf(self, build_from_dir):
         r"""
@@ -55,7 +75,7 @@ class TexFile:
             cwd = self.filepath
         else:
             raise ValueError("Invalid 'build_from_dir' option. Should be one of 'source' or 'cwd'. See documentation for details.")
-        check_call(call, stdout=DEVNULL, stderr=STDOUT, cwd=cwd)
+        subprocess.run(call, stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT, cwd=cwd, check=True)
 
 
 class TexObject:
@@ -83,12 +103,12 @@ class TexObject:
             options (Tuple[Union[str, TexObject]): Options to pass to the package in brackets.
             kwoptions (dict of str): Keyword options to pass to the package in brackets.
         """
-        if not package in self.packages:
+        existing_package = self.packages.get(package)
+        if existing_package is None:
             self.packages[package] = Package(package, *options, **kwoptions)
         else:
-            options = set(options) | set(self.packages[package].options)
-            self.packages[package].options = tuple(options)
-            self.packages[package].kwoptions.update(kwoptions)
+            existing_package.options = tuple(set(options) | set(existing_package.options))
+            existing_package.kwoptions.update(kwoptions)
 
     def add_to_preamble(self, tex_object_or_string):
         self.preamble.append(tex_object_or_string)
@@ -102,7 +122,7 @@ class TexObject:
         return preamble
 
     def build_packages(self):
-        return '\n'.join([build(package, self) for package in self.packages.values()])
+        return '\n'.join(build(package, self) for package in self.packages.values())
 
     def __repr__(self):
         class_name = self.__name__ if '__name__' in self.__dict__ else self.__class__.__name__
@@ -118,8 +138,19 @@ class TexObject:
         return ''
 
 
+# Places the built options with respect to the built parameters for each 'options_pos' of TexCommand
+_ARRANGE_OPTIONS = {
+    'first': lambda options, params: [options] + params,
+    'second': lambda options, params: params[:1] + [options] + params[1:],
+    'last': lambda options, params: params + [options],
+}
+
+
 class TexCommand(TexObject):
-    def __init__(self, command, *parameters, options=list(), options_pos='second', **kwoptions):
+    _built_state = None
+    _built_tex = ''
+
+    def __init__(self, command, *parameters, options=(), options_pos='second', **kwoptions):
         r"""
         Args:
             command (str): Name of the command that will be rendered as '\command'.
@@ -136,33 +167,34 @@ class TexCommand(TexObject):
         self.options_pos = options_pos
 
     def build(self):
-        command = f'\\{self.command}'
+        """
+        Builds the command. The resulting string is reused as long as the command, options and parameters are unchanged. Only commands made of strings are cached, since TexObjects can change without the command knowing about it.
+        """
+        if not all(type(part) is str for part in itertools.chain(self.parameters, self.options, self.kwoptions.values())):
+            return self._build_command()
+
+        state = (self.command, self.options_pos, tuple(self.parameters), tuple(self.options), tuple(self.kwoptions.items()))
+        if state != self._built_state:
+            self._built_state, self._built_tex = state, self._build_command()
+        return self._built_tex
+
+    def _build_command(self):
         options = ''
 
         if self.options or self.kwoptions:
             kwoptions = ', '.join('='.join((build(key, self).replace('_', ' '), build(value, self)))
                                   for key, value in self.kwoptions.items())
-            options = ', '.join([build(opt, self) for opt in self.options])
+            options = ', '.join(build(opt, self) for opt in self.options)
             if kwoptions and options:
                 options += ', '
             options = f'[{options}{kwoptions}]'
 
-        if self.options_pos == 'first':
-            command += options
-            if self.parameters:
-                command += f"{{{'}{'.join([build(param, self) for param in self.parameters])}}}"
-        if self.options_pos == 'second':
-            if self.parameters:
-                command += f'{{{build(self.parameters[0], self)}}}'
-            command += options
-            if len(self.parameters) > 1:
-                command += f"{{{'}{'.join([build(param, self) for param in self.parameters[1:]])}}}"
-        elif self.options_pos == 'last':
-            if self.parameters:
-                command += f"{{{'}{'.join([build(param, self) for param in self.parameters])}}}"
-            command += options
+        params = [f'{{{build(param, self)}}}' for param in self.parameters] # Each parameter is built only once
 
-        return command
+        arrange = _ARRANGE_OPTIONS.get(self.options_pos)
+        parts = arrange(options, params) if arrange is not None else []
+
+        return '\\' + self.command + ''.join(parts)
 
 
 class Package(TexCommand):
@@ -177,7 +209,17 @@ class Package(TexCommand):
                          **kwoptions)
 
 
-class bold(TexCommand):
+class _TextFormatCommand(TexCommand):
+    r"""
+    Text formatting command with a single parameter, such as \textbf{...}, built directly without the options machinery of TexCommand.
+    """
+    def build(self):
+        if self.options or self.kwoptions or len(self.parameters) != 1:
+            return super().build()
+        return '\\' + self.command + '{' + build(self.parameters[0], self) + '}'
+
+
+class bold(_TextFormatCommand):
     r"""
     Applies \textbf{...} command on text.
     """
@@ -189,7 +231,7 @@ class bold(TexCommand):
         super().__init__('textbf', text)
 
 
-class italic(TexCommand):
+class italic(_TextFormatCommand):
     r"""
     Applies \textit{...} command on text.
     """
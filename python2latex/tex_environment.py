@@ -7,7 +7,7 @@ class begin(TexCommand):
     """
     'begin' tex command wrapper.
     """
-    def __init__(self, environment, *parameters, options=list(), options_pos='second', **kwoptions):
+    def __init__(self, environment, *parameters, options=(), options_pos='second', **kwoptions):
         super().__init__('begin',
                          environment,
                          *parameters,
@@ -164,10 +164,11 @@ class TexEnvironment(TexObject):
         Builds a list of objects to build for a TeX string representation.
         Return a TeX string representation of the list.
         """
-        tex = [build(part, self) for part in list_to_build]
-        return '\n'.join([part for part in tex if part])
+        return '\n'.join(filter(None, (build(part, self) for part in list_to_build)))
 
     def _build_body(self):
+        if not self.body:
+            return ''
         return self._build_list(self.body)
 
     def build(self):
@@ -175,16 +176,10 @@ class TexEnvironment(TexObject):
         Builds recursively the environments of the body and converts it to .tex.
         Returns the .tex string of the file.
         """
-        tex = [self.head]
-
-        if self.label_pos == 'top':
-            tex.append(self._label)
-
-        tex.append(self._build_body())
-
-        if self.label_pos == 'bottom':
-            tex.append(self._label)
-
-        tex.append(self.tail)
-
+        tex = [self.head, self._build_body(), self.tail]
+        if self._label.label:
+            if self.label_pos == 'top':
+                tex.insert(1, self._label)
+            elif self.label_pos == 'bottom':
+                tex.insert(2, self._label)
         return self._build_list(tex)
@@ -1,23 +1,15 @@
 import sys
-import os
 import subprocess
 import numpy as np
-from colorspacious import cspace_converter, cspace_convert
-from matplotlib.colors import hsv_to_rgb, rgb_to_hsv
+
+
+# Command that opens a file with the default program of the platform, and whether it must go through the shell ('start' is a shell builtin on Windows)
+_OPEN_COMMAND, _OPEN_WITH_SHELL = ('xdg-open', False) if sys.platform.startswith('linux') else ('start', True)
 
 
 def open_file_with_default_program(filename, filepath):
-    cwd = os.getcwd()
-    try:
-        os.chdir(filepath)
-        if sys.platform.startswith('linux'):
-            open_command = 'xdg-open'
-            subprocess.run([open_command, filename + ".pdf"])
-        else:
-            open_command = 'start'
-            subprocess.run([open_command, filename + ".pdf"], shell=True)
-    finally:
-        os.chdir(cwd)
+    # The command is run from 'filepath' without changing the working directory of the whole process
+    subprocess.run([_OPEN_COMMAND, filename + ".pdf"], shell=_OPEN_WITH_SHELL, cwd=filepath)
 
 
 def gamma_decompress(rgb):
@@ -52,14 +44,21 @@ def rgb2gray(rgb):
 
 
 def JCh2rgb(JCh):
-    J, C, h = JCh
-    return np.clip(cspace_convert((J, C, h%360), 'JCh', 'sRGB1'), 0, 1)
+    """
+    Converts a JCh color, or an array of JCh colors along the last axis, to rgb.
+    """
+    from colorspacious import cspace_convert
+    JCh = np.array(JCh, dtype=float)
+    JCh[..., 2] %= 360
+    return np.clip(cspace_convert(JCh, 'JCh', 'sRGB1'), 0, 1)
 
 def rgb2JCh(rgb):
+    from colorspacious import cspace_convert
     return cspace_convert(rgb, 'sRGB1', 'JCh')
 
 
 def JCh2hsb(JCh, restrict_hue_domain=True):
+    from matplotlib.colors import rgb_to_hsv
     J, C, h = JCh
     hue = h % 360
     hsb = rgb_to_hsv(JCh2rgb((J, C, hue)))
@@ -68,6 +67,7 @@ def JCh2hsb(JCh, restrict_hue_domain=True):
     return hsb
 
 def hsb2JCh(hsb, restrict_hue_domain=True):
+    from matplotlib.colors import hsv_to_rgb
     h, s, b = hsb
     hue = h % 1
     JCh = rgb2JCh(hsv_to_rgb((hue, s, b)))
@@ -1,6 +1,6 @@
 from inspect import cleandoc
 
-from python2latex import Document
+from python2latex import Document, TexCommand
 from python2latex.color import *
 
 
@@ -13,6 +13,12 @@ class TestColor:
         assert color.build() == 'spam'
         assert color.build_preamble() == '\\usepackage{xcolor}\n\\definecolor{spam}{rgb}{3,4,5}'
 
+    def test_preamble_is_updated_when_modified(self):
+        color = Color(3, 4, 5, color_name='spam')
+        assert color.build_preamble() == '\\usepackage{xcolor}\n\\definecolor{spam}{rgb}{3,4,5}'
+        color.color_spec = (.1, .2, .3)
+        assert color.build_preamble() == '\\usepackage{xcolor}\n\\definecolor{spam}{rgb}{0.1,0.2,0.3}'
+
     def test_without_color_name(self):
         color = Color(3, 4, 5)
         assert color.build() == 'color1'
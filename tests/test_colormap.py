@@ -1,9 +1,13 @@
 import os
 import shutil
 from inspect import cleandoc
+from itertools import islice
+import numpy as np
+from pytest import raises
 
 from python2latex.color import Color
-from python2latex.colormap import LinearColorMap, Palette, PREDEFINED_CMAPS, PREDEFINED_PALETTES
+from python2latex.colormap import LinearColorMap, Palette, PREDEFINED_CMAPS, PREDEFINED_PALETTES, holi
+from python2latex.utils import JCh2rgb
 
 
 def areclose(tuple1, tuple2):
@@ -74,6 +78,14 @@ class TestLinearColorMap:
         assert cmap(.75) == c_mid
         assert areclose(cmap(.5), (.2,.2,.2))
 
+    def test_many_anchors(self):
+        color_anchors = [(0,0,0), (.2,.2,.2), (.3,.3,.3), (.6,.6,.6), (1,1,1)]
+        cmap = LinearColorMap(color_anchors=color_anchors, anchor_pos=[0,.1,.5,.6,1], color_model='rgb')
+        assert cmap(0) == color_anchors[0]
+        assert cmap(.5) == color_anchors[2]
+        assert cmap(1) == color_anchors[-1]
+        assert areclose(cmap(.55), (.45,.45,.45))
+
     def test_color_transform(self):
         c_start, c_stop = (0,0,0), (1,1,1)
         transform = lambda c: (c[0], c[1]/2, c[2]+100)
@@ -81,6 +93,30 @@ class TestLinearColorMap:
                               color_transform=transform)
         assert areclose(cmap(.5), (.5, .25, 100.5))
 
+    def test_map_many(self):
+        c_start, c_mid, c_stop = (0,0,0), (.3,.3,.3), (1,1,1)
+        cmap = LinearColorMap(color_anchors=[c_start, c_mid, c_stop],
+                              anchor_pos=[0,.75,1])
+        scalars = [0, .25, .5, .75, .9, 1]
+        assert cmap.map_many(scalars) == [cmap(scalar) for scalar in scalars]
+
+    def test_call_on_array(self):
+        cmap = LinearColorMap(color_anchors=[(0,0,0), (.3,.3,.3), (1,1,1)], anchor_pos=[0,.75,1])
+        scalars = np.array([0, .5, .75, 1])
+        assert cmap(scalars) == cmap.map_many(scalars)
+        assert cmap([.25]) == [cmap(.25)]
+
+    def test_anchors_as_arrays(self):
+        cmap = LinearColorMap(color_anchors=np.array([(0,0,0), (.3,.3,.3), (1,1,1)]),
+                              anchor_pos=np.array([0,.75,1]))
+        assert areclose(cmap(.5), (.2,.2,.2))
+        assert areclose(cmap.map_many([.5])[0], (.2,.2,.2))
+
+    def test_map_many_cyclic(self):
+        cmap = LinearColorMap(color_anchors=[(.1,.2,.3), (1.7,.6,.7)], color_model='hsb')
+        for color, answer in zip(cmap.map_many([.25, .75]), [cmap(.25), cmap(.75)]):
+            assert areclose(color, answer)
+
 
 class TestPalette:
     def test_color_from_list(self):
@@ -107,6 +143,27 @@ class TestPalette:
             assert color.color_spec == colors[i]
             assert color.color_name == names[i]
 
+    def test_color_from_iterable_without_names(self):
+        colors = [(0,0,0), (.3,.3,.3), (1,1,1)]
+        palette = Palette(c for c in colors)
+        assert [color.color_spec for color in palette] == colors
+
+    def test_batch_transform(self):
+        colors = [(26.2, 46.5, 235.2), (71.7, 58.5, 450.1)]
+        calls = []
+        def transform(JCh):
+            calls.append(JCh)
+            return JCh2rgb(JCh)
+
+        palette = Palette(colors, color_model='rgb', color_transform=transform, batch_transform=True)
+        assert len(calls) == 1
+        for color, JCh in zip(palette, colors):
+            assert areclose(color.color_spec, JCh2rgb(JCh))
+
+    def test_empty_palette_with_JCh_transform(self):
+        assert len(Palette([], color_transform=JCh2rgb, batch_transform=True)) == 0
+        assert len(holi(0)) == 0
+
     def test_color_transform(self):
         c_start, c_mid, c_stop = (0,0,0), (.3,.3,.3), (1,1,1)
         colors = [c_start, c_mid, c_stop]
@@ -176,6 +233,14 @@ class TestPalette:
         for color, answer in zip(palette.tex_colors, [(1/6,1/6,1/6), (1/2,1/2,1/2), (5/6,5/6,5/6)]):
             assert color.color_spec == answer
 
+    def test_dynamic_specs_are_tuples(self):
+        cmap = LinearColorMap(color_anchors=[(0,0,0), (1,1,1)], color_model='rgb')
+        palette = Palette(cmap, color_model='rgb', color_transform=JCh2rgb, batch_transform=True)
+        colors = list(islice(palette, 3))
+        assert colors == palette.tex_colors
+        for color in colors:
+            assert type(color.color_spec) is tuple
+
     def test_color_transform_with_dynamic(self):
         c_start, c_mid, c_stop = (0,0,0), (.3,.3,.3), (1,1,1)
         color_anchors = [c_start, c_mid, c_stop]
@@ -208,3 +273,17 @@ class TestPredefined:
         for n in range(1, 5):
             for name in ['aube', 'aurore', 'holi']:
                 assert len(PREDEFINED_PALETTES[name+str(n)]) == n
+
+    def test_added_cmap_is_found(self, monkeypatch):
+        import python2latex.colormap as colormap_module
+        palette = Palette(LinearColorMap(), n_colors=2)
+        monkeypatch.setitem(PREDEFINED_CMAPS, 'my.cmap', palette.colors)
+        monkeypatch.setattr(colormap_module, 'my.cmap', palette, raising=False)
+        assert PREDEFINED_PALETTES['my.cmap'] is palette
+        with raises(KeyError):
+            PREDEFINED_PALETTES['myxcmap']
+
+    def test_unknown_palette_raises(self):
+        for name in ['spam', 'holi5spam', 'ho']:
+            with raises(KeyError):
+                PREDEFINED_PALETTES[name]
@@ -36,6 +36,17 @@ class Test_FloatingEnvironment:
             \end{with_caption}
             ''')
 
+    def test_caption_is_rebuilt_when_modified(self):
+        env = _FloatingEnvironment('with_caption', caption='float caption', caption_space='5pt', centered=False)
+        env.build()
+        env.caption = 'new caption'
+        env.caption_space = ''
+        assert env.build() == cleandoc(r'''
+            \begin{with_caption}[h!]
+            \caption{new caption}
+            \end{with_caption}
+            ''')
+
 
 class TestFloatingFigure:
     def test_floating_figure_caption_bottom_no_space(self):
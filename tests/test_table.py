@@ -46,54 +46,50 @@ class TestTabular:
         assert three_by_three_tabular.data[1, 0] == 'Spam'
         assert three_by_three_tabular.data[2, 1] == 'Egg'
 
+    def test_alignment(self):
+        assert Tabular((2, 3), alignment='l').alignment == ['l', 'l', 'l']
+        assert Tabular((2, 3), alignment=('l', 'c', 'r')).alignment == ['l', 'c', 'r']
+        with raises(ValueError):
+            Tabular((2, 3), alignment=['l', 'c'])
+
     def test_apply_command(self, three_by_three_tabular):
         three_by_three_tabular[0:2,1:3].apply_command(bold)
         three_by_three_tabular[0:2,1:3].apply_command(lambda content: content + ' test')
-        assert three_by_three_tabular._apply_commands(0, 1, '2') == r"\textbf{2} test"
+        assert three_by_three_tabular._apply_command_list(three_by_three_tabular.commands[0, 1], '2') == r"\textbf{2} test"
 
     def test_format_number_default_float(self, three_by_three_tabular):
-        assert three_by_three_tabular._format_number(0, 0, .1) == '0.10'
+        assert three_by_three_tabular._number_formatter()(.1, three_by_three_tabular.formats_spec[0, 0]) == '0.10'
 
     def test_format_number_default_int(self, three_by_three_tabular):
-        assert three_by_three_tabular._format_number(0, 0, 100) == '100'
+        assert three_by_three_tabular._number_formatter()(100, three_by_three_tabular.formats_spec[0, 0]) == '100'
 
     def test_format_number_custom_format_spec(self, three_by_three_tabular):
         three_by_three_tabular[0, 0].format_spec = '.3f'
-        assert three_by_three_tabular._format_number(0, 0, .1) == '0.100'
+        assert three_by_three_tabular._number_formatter()(.1, three_by_three_tabular.formats_spec[0, 0]) == '0.100'
         three_by_three_tabular[0, 1].format_spec = '.3e'
-        assert three_by_three_tabular._format_number(0, 1, 12345.0) == '1.234e+04'
+        assert three_by_three_tabular._number_formatter()(12345.0, three_by_three_tabular.formats_spec[0, 1]) == '1.234e+04'
 
     def test_format_number_decimal_separator(self, three_by_three_tabular):
         three_by_three_tabular.decimal_separator = ','
-        assert three_by_three_tabular._format_number(0, 0, .1) == '0,10'
+        assert three_by_three_tabular._number_formatter()(.1, three_by_three_tabular.formats_spec[0, 0]) == '0,10'
 
     def test_apply_multicells_multicolumn(self, three_by_three_tabular):
         three_by_three_tabular[0, 0:2].multicell('content')
-        tex_array_format = np.array([[' & ']*2 + [r'\\']]*3)
-        tex_array = np.full_like(three_by_three_tabular.data, '', dtype=object)
-
-        for i, row in enumerate(three_by_three_tabular.data):
-            for j, content in enumerate(row):
-                tex_array[i, j] = str(content)
+        tex_array = three_by_three_tabular._build_cells()
 
-        three_by_three_tabular._apply_multicells(tex_array, tex_array_format)
+        blanked_separators = three_by_three_tabular._apply_multicells(tex_array)
 
-        assert isinstance(tex_array[0, 0], multicolumn)
-        assert tex_array_format[0, 0] == ''
+        assert tex_array[0][0] == r'\multicolumn{2}{c}{content}'
+        assert blanked_separators == {(0, 0)}
 
     def test_apply_multicells_multirow(self, three_by_three_tabular):
         three_by_three_tabular[0:2, 0].multicell('content')
-        tex_array_format = np.array([[' & ']*2 + [r'\\']]*3)
-        tex_array = np.full_like(three_by_three_tabular.data, '', dtype=object)
+        tex_array = three_by_three_tabular._build_cells()
 
-        for i, row in enumerate(three_by_three_tabular.data):
-            for j, content in enumerate(row):
-                tex_array[i, j] = str(content)
+        blanked_separators = three_by_three_tabular._apply_multicells(tex_array)
 
-        three_by_three_tabular._apply_multicells(tex_array, tex_array_format)
-
-        assert isinstance(tex_array[0, 0], multirow)
-        assert tex_array_format[0, 0] == ' & '
+        assert tex_array[0][0] == r'\multirow{2}{*}{content}'
+        assert blanked_separators == set()
 
 
 class TestSelectedArea:
@@ -129,6 +125,8 @@ class TestSelectedArea:
 
         with raises(ValueError):
             self.row_area._convert_idx_to_slice((np.array(1), np.array(2)))
+        with raises(ValueError):
+            self.row_area._convert_idx_to_slice((1, 'a'))
 
     def test_idx(self):
         assert self.whole_table_area.idx == ((0, 0), (3, 3))
@@ -137,6 +135,13 @@ class TestSelectedArea:
         assert self.small_area.idx == ((0, 1), (2, 3))
         assert self.one_cell_area.idx == ((0, 0), (1, 1))
 
+    def test_size(self):
+        assert self.whole_table_area.size == 9
+        assert self.row_area.size == 3
+        assert self.small_area.size == 4
+        assert self.one_cell_area.size == 1
+        assert self.table[::2, 1:].size == 4
+
     def test_format_spec(self):
         self.one_cell_area.format_spec = '3e'
         assert self.table.formats_spec[0, 0] == '3e'
@@ -184,6 +189,13 @@ class TestSelectedArea:
         self.small_area.apply_command(mathmode)
         assert self.table.commands[1, 2] == [boldmath, mathmode]
 
+    def test_numeric_view(self):
+        self.table[0, 1] = 'text'
+        values = self.small_area._numeric_view()
+        assert values.dtype == float
+        assert np.isnan(values[0, 0])
+        assert (values[:, 1] == [3, 6]).all()
+
     def test_highlight_best_default(self):
         self.small_area.highlight_best()
         assert self.table.commands[1, 2] == [bold]
@@ -469,3 +481,29 @@ def test_table_with_highlight_best():
         \end{tabular}
         \end{table}
         ''')
+
+
+def test_table_build_is_repeatable():
+    n_rows, n_cols = 3, 3
+    table = Table((n_rows, n_cols))
+    table[:, :] = [[(j * n_cols + i + 1)/10 for i in range(n_cols)] for j in range(n_rows)]
+    table[0:2, 0].multicell('content')
+    table[1:, 1:].highlight_best(not_best=italic)
+    data = table.data.copy()
+
+    assert table.build() == table.build()
+    assert (table.data == data).all()
+
+
+def test_empty_table():
+    table = Table((2, 3), as_float_env=False)
+    table[1, 1:].add_rule()
+    assert table.build() == cleandoc(r'''
+        \begin{tabular}{ccc}
+        \toprule
+         &  & \\
+         &  & \\
+        \cmidrule{2-3}
+        \bottomrule
+        \end{tabular}
+        ''')
@@ -1,6 +1,31 @@
+import os
+from threading import Thread
+
 from python2latex.tex_base import *
 
 
+class TestTexFile:
+    def test_save(self, tmp_path):
+        file = TexFile('test', str(tmp_path))
+        file.save('first')
+        file.save('second')
+        with open(file.path, encoding='utf8') as f:
+            assert f.read() == 'second'
+        assert os.listdir(tmp_path) == ['test.tex']
+
+    def test_save_from_many_threads(self, tmp_path):
+        file = TexFile('test', str(tmp_path))
+        texs = [f'content {i}' for i in range(8)]
+        threads = [Thread(target=file.save, args=(tex,)) for tex in texs]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        with open(file.path, encoding='utf8') as f:
+            assert f.read() in texs
+        assert os.listdir(tmp_path) == ['test.tex']
+
+
 class TestTexObject:
     def setup(self):
         self.tex_obj = TexObject('DefaultTexObject')
@@ -20,6 +45,18 @@ class TestTexObject:
         assert self.tex_obj.packages[package_name].options == ['spam', 'egg']
         assert self.tex_obj.packages[package_name].kwoptions == {'answer': 42, 'question': "We don't know"}
 
+    def test_build_merges_packages_in_parent(self):
+        child = TexObject('child')
+        child.add_package('package', 'spam', answer=42)
+        self.tex_obj.add_package('package', 'egg')
+        build(child, self.tex_obj)
+        assert set(self.tex_obj.packages['package'].options) == {'spam', 'egg'}
+        assert self.tex_obj.packages['package'].kwoptions == {'answer': 42}
+
+        options = self.tex_obj.packages['package'].options
+        build(child, self.tex_obj)
+        assert self.tex_obj.packages['package'].options is options
+
     def test_repr(self):
         assert repr(self.tex_obj) == 'TexObject DefaultTexObject'
 
@@ -65,6 +102,15 @@ class TestTexCommand:
     def test_str(self):
         assert f"{TexCommand('test')}" == r'\test'
 
+    def test_build_is_updated_when_modified(self):
+        command = TexCommand('test', 'param', options=['opt'])
+        assert command.build() == r'\test{param}[opt]'
+        command.parameters[0] = 'other'
+        command.kwoptions['key'] = 'value'
+        assert command.build() == r'\test{other}[opt, key=value]'
+        command.parameters[0] = bold('text')
+        assert command.build() == r'\test{\textbf{text}}[opt, key=value]'
+
 
 def test_bold():
     assert bold('test').build() == r'\textbf{test}'
@@ -140,3 +140,9 @@ class TestTexEnvironment:
             text 2
             \end{test}
             ''')
+
+    def test_end_is_rebuilt_when_modified(self):
+        tail = end('test')
+        assert tail.build() == r'\end{test}'
+        tail.parameters[0] = 'other'
+        assert tail.build() == r'\end{other}'